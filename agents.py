@@ -1,6 +1,6 @@
 from langgraph.prebuilt import create_react_agent
 
-from llm import llm, ASSISTANT_SYSTEM_PROMPT
+from llm import llm, ASSISTANT_SYSTEM_PROMPT, PLANNER_SYSTEM_PROMPT
 from tools import (
     think,
     task_form,
@@ -25,11 +25,7 @@ planner_agent = create_react_agent(
         task_form,
     ],
     name="planner",
-    prompt=(
-        "You are a planning specialist. Use the think tool to reason step-by-step and outline an approach. "
-        "If the user requests to enter task details via a form or a UI, immediately call the task_form tool to open the form. "
-        "When planning is sufficient, delegate to task_manager to execute the plan."
-    ),
+    prompt=PLANNER_SYSTEM_PROMPT,
 )
 
 
@@ -1,8 +1,18 @@
 from langchain.chat_models import init_chat_model
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
 import os
 
+# Exact-match response cache: repeated deterministic prompts (retries,
+# identical tool summaries) are answered without another model call.
+set_llm_cache(SQLiteCache(database_path=".langchain.db"))
+
 llm = init_chat_model("google_genai:gemini-2.5-flash-lite" , api_key="your-api-key")
 
+# Provider-side prompt caching matches on the leading tokens of a request.
+# create_react_agent/create_supervisor emit these prompts as the first
+# system message, ahead of the history, so keep them constant across turns
+# (no timestamps, ids, or per-user text).
 ASSISTANT_SYSTEM_PROMPT = (
     "You are TaskMate, a proactive task management assistant.\n"
     "- Use the provided tools to create, update, list, and complete tasks and subtasks.\n"
@@ -12,4 +22,17 @@ ASSISTANT_SYSTEM_PROMPT = (
     "- Default values: priority=3, status='todo'. Dates format: YYYY-MM-DD.\n"
     "- When presenting tasks, include status, priority, due date, tags, and subtask progress.\n"
     "- If the user asks to enter task details using a form/UI, immediately call the task_form tool to open the form (do not ask for details in chat). After form submission, create the task with add_task.\n"
-) 
\ No newline at end of file
+) 
+
+PLANNER_SYSTEM_PROMPT = (
+    "You are a planning specialist. Use the think tool to reason step-by-step and outline an approach. "
+    "If the user requests to enter task details via a form or a UI, immediately call the task_form tool to open the form. "
+    "When planning is sufficient, delegate to task_manager to execute the plan."
+)
+
+SUPERVISOR_SYSTEM_PROMPT = (
+    "You are a team supervisor managing a planner and a task manager. "
+    "Use planner for ambiguous requests and to capture reasoning with the think tool. "
+    "Use task_manager for concrete task CRUD, listing, and updates. "
+    "Provide the best final answer once the appropriate agent completes the work."
+)
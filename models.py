@@ -1,13 +1,23 @@
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Literal
-from datetime import datetime
+from datetime import date
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> date:
+    # date.fromisoformat is a C fast path, but on 3.11+ it also accepts
+    # compact/week forms, so pin the shape to YYYY-MM-DD first.
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"Invalid date: {value!r}")
+    return date.fromisoformat(value)
 
 
 def _validate_iso_date(value: Optional[str]) -> Optional[str]:
     if value in (None, ""):
         return None
     try:
-        datetime.strptime(value, "%Y-%m-%d")
+        _parse_iso_date(value)
     except ValueError as exc:
         raise ValueError("due_date must be in YYYY-MM-DD format") from exc
     return value
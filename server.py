@@ -1,8 +1,13 @@
 from fastapi import FastAPI, Request, Depends
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import asyncio
+import orjson
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 import urllib.parse
 import time
@@ -10,13 +15,17 @@ import time
 from app import graph
 
 
-app = FastAPI(title="Agent Chat")
+app = FastAPI(title="Agent Chat", default_response_class=ORJSONResponse)
 
 # Static dir placeholder (for potential future assets). Not strictly needed for Tailwind CDN.
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 templates = Jinja2Templates(directory="templates")
 
+# Partials rendered inside the /stream loop, resolved once at import
+_TASK_FORM_TMPL = templates.get_template("partials/task_form.html")
+_MSG_TMPL = templates.get_template("partials/message.html")
+
 
 def get_thread_id(request: Request) -> str:
     # Use a cookie-based thread id; generate if missing
@@ -66,17 +75,64 @@ async def send_message(request: Request, thread_id: str = Depends(get_thread_id)
     )
 
 
-def _sse_event(event: str, data: str) -> str:
-    """Format a Server-Sent Event string for StreamingResponse."""
-    # Ensure each line of data is prefixed with 'data: '
-    # and terminate the event with a blank line
-    if data is None:
-        data = ""
-    # Replace CR to avoid breaking SSE framing
-    data = data.replace("\r", "")
-    payload_lines = [f"data: {line}" for line in data.split("\n")]
-    payload = "\n".join(payload_lines)
-    return f"event: {event}\n{payload}\n\n"
+# Concurrent agent runs are capped; extra /stream requests wait for a slot
+# instead of spawning more threads. The semaphore is released when a run's
+# pump thread finishes, so it bounds real work even after client disconnects.
+_AGENT_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+_AGENT_POOL = ThreadPoolExecutor(max_workers=_AGENT_CONCURRENCY, thread_name_prefix="agent")
+_AGENT_SEM = asyncio.Semaphore(_AGENT_CONCURRENCY)
+
+# Sentinel pushed by the stream pump once graph.stream is exhausted
+_STREAM_DONE = object()
+
+# Shortest assistant text the form heuristic can match ("formfill")
+_FORM_HINT_MIN_LEN = 8
+
+
+def _is_form_hint(content: str) -> bool:
+    """Heuristic: does assistant text ask the user to fill in a task form?"""
+    if len(content) < _FORM_HINT_MIN_LEN:
+        return False
+    c = content.lower()
+    return (
+        ("form" in c and ("fill" in c or "below" in c))
+        or ("title:" in c and "priority" in c and "due" in c)
+    )
+
+# Status lines arriving within this window are coalesced into one SSE frame.
+# The allowed batch size grows 1, 3, 9, ... so the first status goes out at once.
+_STATUS_BATCH_WINDOW = 0.05
+_STATUS_BATCH_MAX = 27
+
+
+def _sse_event(event: str, data: str) -> bytes:
+    """Format a Server-Sent Event as bytes for StreamingResponse."""
+    # Prefix each line of data with 'data: ' and terminate with a blank line;
+    # replace CR to avoid breaking SSE framing
+    payload = (data or "").replace("\r", "").replace("\n", "\ndata: ")
+    return b"event: %b\ndata: %b\n\n" % (event.encode("utf-8"), payload.encode("utf-8"))
+
+
+# Frames with constant content, encoded once
+_SSE_QUEUED = _sse_event("status", "Queued…")
+_SSE_WAITING = _sse_event("status", "Waiting for a free agent slot…")
+_SSE_TOKEN_START = _sse_event("token_start", "")
+_SSE_FINAL_EMPTY = _sse_event("final", "")
+
+
+def _answer_token(chunk: Any, metadata: Dict[str, Any]) -> Optional[str]:
+    """Return the text delta of an agent LLM chunk, or None if it should not be streamed."""
+    if getattr(chunk, "type", None) != "AIMessageChunk":
+        return None
+    content = getattr(chunk, "content", None)
+    if not isinstance(content, str) or not content:
+        return None
+    # Top-level graph node that produced the chunk, e.g. "task_manager:<id>|agent:<id>"
+    ns = metadata.get("langgraph_checkpoint_ns") or metadata.get("langgraph_node") or ""
+    top_node = ns.split("|", 1)[0].split(":", 1)[0]
+    if "supervisor" in top_node.lower():
+        return None
+    return content
 
 
 @app.get("/stream")
@@ -87,7 +143,7 @@ async def stream_events(request: Request):
 
     async def event_generator():
         # Initial status
-        yield _sse_event("status", "Queued…")
+        yield _SSE_QUEUED
 
         config = {"configurable": {"thread_id": thread_id}}
         inputs = {"messages": [("user", q)]}
@@ -96,8 +152,80 @@ async def stream_events(request: Request):
         last_non_supervisor_assistant = None
         form_injected = False
         step = 0
+        streaming_msg_id = None
+
+        # graph.stream is a blocking iterator: run it on a worker thread and
+        # hand events back to the event loop through a queue.
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def _pump() -> None:
+            try:
+                # "values" drives statuses and the final bubble, "messages" the live tokens
+                for item in graph.stream(inputs, config=config, stream_mode=["values", "messages"]):
+                    if cancelled.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, item)
+            except Exception as exc:
+                loop.call_soon_threadsafe(queue.put_nowait, exc)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _STREAM_DONE)
+
+        pending_status: List[str] = []
+        batch_limit = 1
+        # Loop time by which the oldest pending status must be sent
+        batch_deadline: Optional[float] = None
+
+        def _take_status_batch() -> bytes:
+            nonlocal batch_limit, batch_deadline
+            frame = _sse_event("status", "\n".join(pending_status))
+            pending_status.clear()
+            batch_limit = min(batch_limit * 3, _STATUS_BATCH_MAX)
+            batch_deadline = None
+            return frame
+
+        if _AGENT_SEM.locked():
+            yield _SSE_WAITING
+        await _AGENT_SEM.acquire()
+        pump = loop.run_in_executor(_AGENT_POOL, _pump)
+        pump.add_done_callback(lambda _: _AGENT_SEM.release())
         try:
-            for event in graph.stream(inputs, config=config, stream_mode="values"):
+            while True:
+                if pending_status:
+                    if batch_deadline is None:
+                        batch_deadline = loop.time() + _STATUS_BATCH_WINDOW
+                    remaining = batch_deadline - loop.time()
+                    if len(pending_status) >= batch_limit or remaining <= 0:
+                        yield _take_status_batch()
+                try:
+                    if pending_status:
+                        event = await asyncio.wait_for(queue.get(), remaining)
+                    else:
+                        event = await queue.get()
+                except asyncio.TimeoutError:
+                    yield _take_status_batch()
+                    continue
+                if event is _STREAM_DONE:
+                    break
+                if isinstance(event, Exception):
+                    final_text_any = f"Error: {event}"
+                    continue
+                mode, event = event
+                if mode == "messages":
+                    chunk, metadata = event
+                    delta = _answer_token(chunk, metadata)
+                    if delta is None:
+                        continue
+                    # Statuses that preceded this token must reach the client first
+                    if pending_status:
+                        yield _take_status_batch()
+                    # New assistant message: tell the client to reset its live bubble
+                    if getattr(chunk, "id", None) != streaming_msg_id:
+                        streaming_msg_id = getattr(chunk, "id", None)
+                        yield _SSE_TOKEN_START
+                    yield _sse_event("token", delta)
+                    continue
                 step += 1
                 # Try to surface meaningful status based on the newest message
                 try:
@@ -121,13 +249,10 @@ async def stream_events(request: Request):
                         # Heuristic: if assistant says to fill a form, inject the UI form
                         if not form_injected:
                             try:
-                                c = (content or "").lower()
-                                if (
-                                    ("form" in c and ("fill" in c or "below" in c))
-                                    or ("title:" in c and "priority" in c and "due" in c)
-                                ):
-                                    tmpl = templates.get_template("partials/task_form.html")
-                                    form_html = tmpl.render(thread_id=thread_id)
+                                if _is_form_hint(content or ""):
+                                    form_html = _TASK_FORM_TMPL.render(thread_id=thread_id)
+                                    if pending_status:
+                                        yield _take_status_batch()
                                     yield _sse_event("ui", form_html)
                                     form_injected = True
                             except Exception:
@@ -143,12 +268,13 @@ async def stream_events(request: Request):
                         should_inject_form = False
                     if should_inject_form and not form_injected:
                         try:
-                            tmpl = templates.get_template("partials/task_form.html")
-                            form_html = tmpl.render(thread_id=thread_id)
+                            form_html = _TASK_FORM_TMPL.render(thread_id=thread_id)
+                            if pending_status:
+                                yield _take_status_batch()
                             yield _sse_event("ui", form_html)
                             form_injected = True
                         except Exception:
-                            yield _sse_event("status", "UI: task form unavailable")
+                            pending_status.append("UI: task form unavailable")
 
                     # Only show summarized, tool/step-like statuses; skip user/assistant and supervisor
                     if role_lower in ("user", "ai", "assistant"):
@@ -163,23 +289,26 @@ async def stream_events(request: Request):
                     else:
                         status_line = f"{role.capitalize()}"
 
-                    yield _sse_event("status", status_line)
+                    pending_status.append(status_line)
                 except Exception:
                     # Fallback generic status
-                    yield _sse_event("status", f"Processing… step {step}")
-        except Exception as e:
-            final_text_any = f"Error: {e}"
+                    pending_status.append(f"Processing… step {step}")
+        finally:
+            # Client went away or we finished: stop the pump at its next step
+            cancelled.set()
+
+        if pending_status:
+            yield _take_status_batch()
 
         # Prefer last non-supervisor assistant text; otherwise fall back to any assistant text
         final_text_to_send = last_non_supervisor_assistant or final_text_any or ""
 
         # Render final assistant bubble HTML and send as 'final' (skip if empty)
         if final_text_to_send:
-            tmpl = templates.get_template("partials/message.html")
-            final_html = tmpl.render(role="assistant", content=final_text_to_send)
+            final_html = _MSG_TMPL.render(role="assistant", content=final_text_to_send)
             yield _sse_event("final", final_html)
         else:
-            yield _sse_event("final", "")
+            yield _SSE_FINAL_EMPTY
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -192,17 +321,39 @@ async def reset_chat(request: Request):
     return response
 
 
+async def _read_form_payload(request: Request) -> Optional[Dict[str, Any]]:
+    """Read a JSON body with orjson, falling back to urlencoded/multipart forms.
+
+    Returns None when a JSON body is malformed or not an object.
+    """
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            payload = orjson.loads(await request.body())
+        except orjson.JSONDecodeError:
+            return None
+        return payload if isinstance(payload, dict) else None
+    return dict(await request.form())
+
+
 @app.post("/submit_task_form", response_class=HTMLResponse)
 async def submit_task_form(request: Request, thread_id: str = Depends(get_thread_id)):
-    form = await request.form()
-    # Gather fields from form
-    task_id = (form.get("task_id") or "").strip()
-    description = (form.get("description") or "").strip()
-    priority = (form.get("priority") or "").strip()
-    status = (form.get("status") or "").strip()
-    due_date = (form.get("due_date") or "").strip()
-    tags = (form.get("tags") or "").strip()
-    notes = (form.get("notes") or "").strip()
+    form = await _read_form_payload(request)
+    if form is None:
+        return HTMLResponse("Invalid JSON body", status_code=400)
+    # Gather fields from form; JSON clients may send non-string values
+    def field(key: str) -> str:
+        value = form.get(key)
+        return "" if value is None else str(value).strip()
+
+    task_id = field("task_id")
+    description = field("description")
+    priority = field("priority")
+    status = field("status")
+    due_date = field("due_date")
+    tags = field("tags")
+    notes = field("notes")
+    if not task_id or not description:
+        return HTMLResponse("task_id and description are required", status_code=400)
 
     # Build a concise instruction for the agent to create the task via tools
     # We do not show this message in the UI; it will stream in background and append only assistant output
@@ -1,9 +1,15 @@
-import json
+import atexit
 import os
-from typing import Dict, List
-from datetime import datetime
+import threading
+from functools import lru_cache, wraps
+from itertools import count
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from datetime import date
 
-from models import Task, SubTask
+import orjson
+from sortedcontainers import SortedList
+
+from models import Task, SubTask, _parse_iso_date
 
 
 # In-memory state and persistence
@@ -11,6 +17,31 @@ TASKS_PATH = os.path.join(os.path.dirname(__file__), "tasks.json")
 processed_tasks: Dict[str, Task] = {}
 thought_log: List[str] = []
 
+# Secondary indexes over processed_tasks; kept in sync by _store_task/_drop_task
+status_index: Dict[str, Set[str]] = {}
+tag_index: Dict[str, Set[str]] = {}
+due_sorted: SortedList = SortedList()  # (due date, task id)
+invalid_due_ids: Set[str] = set()  # due_date set but not a valid YYYY-MM-DD
+# task id -> (insertion seq, status, tags, due date) as currently indexed
+_index_entries: Dict[str, Tuple[int, str, Tuple[str, ...], Optional[date]]] = {}
+_insertion_seq = count()
+
+# Per-task derived strings, dropped whenever the task is stored or removed:
+# task id -> _format_task output, and task id -> lowercase search text
+_formatted_cache: Dict[str, str] = {}
+_search_cache: Dict[str, str] = {}
+
+# Bumped on every mutation; read-only tool results are memoized per version
+_tasks_version = 0
+
+# Mutations within this window (e.g. a process_tasks burst) share one write
+_SAVE_DELAY = 0.2
+# Back-off before retrying a failed write (disk full, permissions, ...)
+_SAVE_RETRY_DELAY = 5.0
+_save_lock = threading.Lock()
+_save_timer: Optional[threading.Timer] = None
+_dirty = False
+
 
 def _task_to_dict(task: Task) -> dict:
     # Support Pydantic v1 and v2
@@ -20,31 +51,190 @@ def _task_to_dict(task: Task) -> dict:
         return task.dict()
 
 
+def _parse_due(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return _parse_iso_date(value)
+    except ValueError:
+        return None
+
+
+def _unindex_task(task_id: str) -> Optional[int]:
+    entry = _index_entries.pop(task_id, None)
+    if entry is None:
+        return None
+    seq, status, tags, due = entry
+    status_index.get(status, set()).discard(task_id)
+    for tag in tags:
+        tag_index.get(tag, set()).discard(task_id)
+    if due is not None:
+        due_sorted.discard((due, task_id))
+    invalid_due_ids.discard(task_id)
+    return seq
+
+
+def _index_task(task: Task) -> None:
+    # Keep the original insertion position when re-indexing an existing id
+    seq = _unindex_task(task.id)
+    if seq is None:
+        seq = next(_insertion_seq)
+    tags = tuple(dict.fromkeys(task.tags))
+    due = _parse_due(task.due_date)
+    _index_entries[task.id] = (seq, task.status, tags, due)
+    status_index.setdefault(task.status, set()).add(task.id)
+    for tag in tags:
+        tag_index.setdefault(tag, set()).add(task.id)
+    if due is not None:
+        due_sorted.add((due, task.id))
+    elif task.due_date:
+        invalid_due_ids.add(task.id)
+
+
+def _bump_tasks_version() -> None:
+    global _tasks_version
+    _tasks_version += 1
+
+
+def memo_read(fn: Callable[..., str]) -> Callable[..., str]:
+    """Memoize a read-only tool on its arguments and the current tasks version."""
+    @lru_cache(maxsize=256)
+    def cached(version: int, args: tuple, kwargs: tuple) -> str:
+        return fn(*args, **dict(kwargs))
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs) -> str:
+        return cached(_tasks_version, args, tuple(sorted(kwargs.items())))
+
+    return wrapper
+
+
+def _store_task(task: Task) -> None:
+    """Insert or replace a task and refresh its index entries."""
+    processed_tasks[task.id] = task
+    _bump_tasks_version()
+    _formatted_cache.pop(task.id, None)
+    _search_cache.pop(task.id, None)
+    _index_task(task)
+
+
+def _drop_task(task_id: str) -> Optional[Task]:
+    """Remove a task and its index entries; returns the removed task."""
+    _unindex_task(task_id)
+    _bump_tasks_version()
+    _formatted_cache.pop(task_id, None)
+    _search_cache.pop(task_id, None)
+    return processed_tasks.pop(task_id, None)
+
+
+def _clear_tasks() -> None:
+    processed_tasks.clear()
+    _bump_tasks_version()
+    status_index.clear()
+    tag_index.clear()
+    due_sorted.clear()
+    invalid_due_ids.clear()
+    _index_entries.clear()
+    _formatted_cache.clear()
+    _search_cache.clear()
+
+
+def _insertion_order(task_id: str) -> int:
+    return _index_entries[task_id][0]
+
+
+def _write_tasks() -> None:
+    serializable = {task_id: _task_to_dict(task) for task_id, task in list(processed_tasks.items())}
+    tmp_path = TASKS_PATH + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(serializable, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    # Atomic swap so a crash mid-write never leaves a truncated tasks.json
+    os.replace(tmp_path, TASKS_PATH)
+
+
+def _arm_save_timer(delay: float) -> None:
+    # Caller holds _save_lock
+    global _save_timer
+    if _save_timer is None:
+        _save_timer = threading.Timer(delay, _flush_tasks)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+def _flush_tasks() -> None:
+    global _dirty, _save_timer
+    with _save_lock:
+        _save_timer = None
+        if not _dirty:
+            return
+        try:
+            _write_tasks()
+        except Exception:
+            # Stay dirty and retry later so the change is not silently lost
+            _arm_save_timer(_SAVE_RETRY_DELAY)
+            raise
+        _dirty = False
+
+
 def _save_tasks() -> None:
-    serializable = {task_id: _task_to_dict(task) for task_id, task in processed_tasks.items()}
-    with open(TASKS_PATH, "w", encoding="utf-8") as f:
-        json.dump(serializable, f, indent=2, ensure_ascii=False)
+    # Mark state dirty and schedule a debounced flush
+    global _dirty
+    _bump_tasks_version()
+    with _save_lock:
+        _dirty = True
+        _arm_save_timer(_SAVE_DELAY)
+
+
+def _construct_task(payload: dict) -> Task:
+    # tasks.json is our own serialized output, so skip validation on load.
+    # model_construct does not build nested models, so do the subtasks here.
+    payload = dict(payload)
+    payload["sub_tasks"] = [SubTask.model_construct(**st) for st in payload.get("sub_tasks") or []]
+    if payload.get("sub_task"):
+        payload["sub_task"] = SubTask.model_construct(**payload["sub_task"])
+    return Task.model_construct(**payload)
 
 
 def _load_tasks() -> None:
     if not os.path.exists(TASKS_PATH):
         return
     try:
-        with open(TASKS_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(TASKS_PATH, "rb") as f:
+            data = orjson.loads(f.read())
         if not isinstance(data, dict):
             return
         for task_id, task_payload in data.items():
             # Backward-compat for old schema
             if isinstance(task_payload, dict) and "sub_tasks" not in task_payload:
                 task_payload["sub_tasks"] = []
-            processed_tasks[task_id] = Task(**task_payload)
+            _store_task(_construct_task(task_payload))
     except Exception:
         # Ignore corrupted storage to avoid crashing the agent
         pass
 
 
 def _format_task(task: Task) -> str:
+    # Only the stored object may use the id-keyed cache; a detached copy
+    # with the same id (e.g. an earlier duplicate in a batch) is built fresh
+    if processed_tasks.get(task.id) is not task:
+        return _build_format(task)
+    cached = _formatted_cache.get(task.id)
+    if cached is None:
+        cached = _formatted_cache[task.id] = _build_format(task)
+    return cached
+
+
+def _search_text(task: Task) -> str:
+    """Lowercased id/description/tags/notes used by list_tasks(search=...)."""
+    cached = _search_cache.get(task.id)
+    if cached is None:
+        cached = _search_cache[task.id] = " ".join(
+            (task.id, task.description, " ".join(task.tags), task.notes or "")
+        ).lower()
+    return cached
+
+
+def _build_format(task: Task) -> str:
     parts: List[str] = []
     parts.append(f"[{task.status.upper()}] {task.id}: '{task.description}' (priority {task.priority})")
     if task.due_date:
@@ -56,12 +246,13 @@ def _format_task(task: Task) -> str:
             f"subtask: '{task.sub_task.name}' (Completed: {task.sub_task.is_completed})"
         )
     if task.sub_tasks:
-        subs = "; ".join([f"{st.name}{'✔' if st.is_completed else ''}" for st in task.sub_tasks])
+        subs = "; ".join(f"{st.name}{'✔' if st.is_completed else ''}" for st in task.sub_tasks)
         parts.append(f"subtasks: [{subs}]")
     if task.notes:
         parts.append(f"notes: {task.notes}")
     return ", ".join(parts)
 
 
-# Initialize on import
-_load_tasks() 
\ No newline at end of file
+# Initialize on import; write out any pending debounced save on exit
+_load_tasks()
+atexit.register(_flush_tasks) 
\ No newline at end of file
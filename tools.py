@@ -1,10 +1,26 @@
-from typing import List, Optional, Literal
-from datetime import datetime
+from typing import List, Optional, Literal, Set
+from datetime import date
+from itertools import takewhile
 
 from langchain_core.tools import tool
 
-from models import Task, SubTask, _validate_iso_date
-from storage import processed_tasks, _save_tasks, _format_task, thought_log
+from models import Task, SubTask, _parse_iso_date, _validate_iso_date
+from storage import (
+    processed_tasks,
+    status_index,
+    tag_index,
+    due_sorted,
+    invalid_due_ids,
+    _save_tasks,
+    _store_task,
+    _drop_task,
+    _clear_tasks,
+    _insertion_order,
+    _format_task,
+    _search_text,
+    memo_read,
+    thought_log,
+)
 
 
 @tool
@@ -28,7 +44,7 @@ def add_task(task: Task) -> str:
     Args:
         task: A Task object to create or replace.
     """
-    processed_tasks[task.id] = task
+    _store_task(task)
     _save_tasks()
     return f"Saved: {_format_task(task)}"
 
@@ -43,13 +59,14 @@ def process_tasks(tasks: List[Task]) -> str:
     """
     results = []
     for task in tasks:
-        processed_tasks[task.id] = task
+        _store_task(task)
         results.append(_format_task(task))
     _save_tasks()
     return f"Processed {len(tasks)} task(s):\n" + "\n".join(results)
 
 
 @tool
+@memo_read
 def get_task(task_id: str) -> str:
     """
     Retrieve a specific task by ID.
@@ -64,16 +81,18 @@ def get_task(task_id: str) -> str:
 
 
 @tool
+@memo_read
 def get_tasks() -> str:
     """
     Retrieve all processed tasks.
     """
     if not processed_tasks:
         return "No tasks have been processed yet."
-    return "\n".join([_format_task(task) for task in processed_tasks.values()])
+    return "\n".join(_format_task(task) for task in processed_tasks.values())
 
 
 @tool
+@memo_read
 def list_tasks(
     filter_status: Optional[Literal["todo", "in_progress", "done"]] = None,
     min_priority: Optional[int] = None,
@@ -88,54 +107,56 @@ def list_tasks(
 
     Date filters use YYYY-MM-DD.
     """
-    def parse_date(s: Optional[str]) -> Optional[datetime]:
+    def parse_date(s: Optional[str]) -> Optional[date]:
         if not s:
             return None
         try:
-            return datetime.strptime(s, "%Y-%m-%d")
+            return _parse_iso_date(s)
         except ValueError:
             return None
 
     d_before = parse_date(due_before)
     d_after = parse_date(due_after)
 
+    # Narrow candidates through the secondary indexes; None means "all tasks"
+    candidates: Optional[Set[str]] = None
+    if filter_status:
+        candidates = set(status_index.get(filter_status, ()))
+    if tag:
+        tagged = tag_index.get(tag, set())
+        candidates = set(tagged) if candidates is None else candidates & tagged
+
+    # Tasks without a due date are kept; dated ones must fall strictly inside
+    # the range, and ones whose due date does not parse are dropped
+    excluded: Set[str] = set()
+    if d_before or d_after:
+        excluded.update(invalid_due_ids)
+    if d_after:
+        excluded.update(task_id for due, task_id in takewhile(lambda entry: entry[0] <= d_after, due_sorted))
+    if d_before:
+        excluded.update(task_id for _, task_id in due_sorted.irange(minimum=(d_before,)))
+
+    needle = search.lower() if search else None
+
     def include(task: Task) -> bool:
-        if filter_status and task.status != filter_status:
+        if task.id in excluded:
             return False
         if min_priority is not None and task.priority < min_priority:
             return False
         if max_priority is not None and task.priority > max_priority:
             return False
-        if tag and tag not in task.tags:
+        if needle and needle not in _search_text(task):
             return False
-        if d_before and task.due_date:
-            try:
-                if datetime.strptime(task.due_date, "%Y-%m-%d") >= d_before:
-                    pass
-            except ValueError:
-                return False
-        if d_after and task.due_date:
-            try:
-                if datetime.strptime(task.due_date, "%Y-%m-%d") <= d_after:
-                    pass
-            except ValueError:
-                return False
-        if search:
-            s = search.lower()
-            haystack = " ".join([
-                task.id,
-                task.description,
-                " ".join(task.tags),
-                task.notes or "",
-            ]).lower()
-            if s not in haystack:
-                return False
         return True
 
-    filtered = [task for task in processed_tasks.values() if include(task)]
+    if candidates is None:
+        pool = processed_tasks.values()
+    else:
+        pool = [processed_tasks[task_id] for task_id in sorted(candidates, key=_insertion_order)]
+    filtered = [task for task in pool if include(task)]
     if not filtered:
         return "No tasks match the given filters."
-    return "\n".join([_format_task(t) for t in filtered])
+    return "\n".join(_format_task(t) for t in filtered)
 
 
 @tool
@@ -155,27 +176,30 @@ def update_task(
     if not task:
         return f"Task with ID '{task_id}' not found."
 
+    # Validate before mutating so a rejected update leaves the task untouched
+    if priority is not None and not (1 <= priority <= 5):
+        return "priority must be between 1 and 5"
+    if due_date is not None:
+        # validate via helper
+        try:
+            _validate_iso_date(due_date)
+        except Exception as e:
+            return str(e)
+
     if description is not None:
         task.description = description
     if priority is not None:
-        if not (1 <= priority <= 5):
-            return "priority must be between 1 and 5"
         task.priority = priority
     if status is not None:
         task.status = status
     if due_date is not None:
-        # validate via helper
-        try:
-            _validate_iso_date(due_date)
-        except Exception as e:
-            return str(e)
         task.due_date = due_date or None
     if tags is not None:
         task.tags = tags
     if notes is not None:
         task.notes = notes
 
-    processed_tasks[task_id] = task
+    _store_task(task)
     _save_tasks()
     return f"Updated: {_format_task(task)}"
 
@@ -189,7 +213,7 @@ def complete_task(task_id: str) -> str:
     if not task:
         return f"Task with ID '{task_id}' not found."
     task.status = "done"
-    processed_tasks[task_id] = task
+    _store_task(task)
     _save_tasks()
     return f"Completed: {_format_task(task)}"
 
@@ -203,7 +227,7 @@ def add_sub_task(task_id: str, name: str) -> str:
     if not task:
         return f"Task with ID '{task_id}' not found."
     task.sub_tasks.append(SubTask(name=name, is_completed=False))
-    processed_tasks[task_id] = task
+    _store_task(task)
     _save_tasks()
     return f"Added sub-task to {task_id}: {name}"
 
@@ -219,6 +243,7 @@ def complete_sub_task(task_id: str, sub_task_name: str) -> str:
     for st in task.sub_tasks:
         if st.name == sub_task_name:
             st.is_completed = True
+            _store_task(task)
             _save_tasks()
             return f"Completed sub-task '{sub_task_name}' in {task_id}."
     return f"Sub-task '{sub_task_name}' not found in {task_id}."
@@ -230,7 +255,7 @@ def delete_task(task_id: str) -> str:
     Delete a specific task by its ID.
     """
     if task_id in processed_tasks:
-        deleted_task = processed_tasks.pop(task_id)
+        deleted_task = _drop_task(task_id)
         _save_tasks()
         return f"Deleted: {task_id} ('{deleted_task.description}')"
     else:
@@ -243,7 +268,7 @@ def remove_all_tasks() -> str:
     Remove all processed tasks.
     """
     count = len(processed_tasks)
-    processed_tasks.clear()
+    _clear_tasks()
     _save_tasks()
     return f"Successfully removed all {count} task(s)."
 